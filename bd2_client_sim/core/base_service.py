@@ -11,7 +11,6 @@ import json
 import requests
 from datetime import datetime
 import pickle
-import logging
 from .sse_manager import SSEManager
 
 
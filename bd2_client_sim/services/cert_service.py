@@ -5,12 +5,10 @@ Changelog:
 - 2025-03-10: Initial creation.
 """
 
-from typing import Optional, Dict, Any
+from typing import Optional
 import requests
 import time
 import os
-import json
-from datetime import datetime
 
 from ..core.endpoint_manager import EndpointManager
 from ..core.result import Result
@@ -5,24 +5,128 @@ BD2 负载测试工具
 """
 
 import os
+import re
 import sys
+import string
 import yaml
 import time
+import math
+import random
+import bisect
+import itertools
 import logging
-import importlib.util
-from typing import Dict, Any, List, Optional
+import threading
+from typing import Dict, Any, List, Optional, Tuple
 from datetime import datetime
 from utils.logger_manager import LoggerManager
 from utils.cli.bd2_load_test.cli_parser import CLIParser
+from bd2_client_sim.client_sim import BD2ClientSim
 import subprocess
 
-# 使用importlib导入BD2ClientSim
-root_dir = os.path.dirname(os.path.abspath(__file__))
-bd2_client_sim_path = os.path.join(root_dir, "bd2_client_sim.py")
-spec = importlib.util.spec_from_file_location("bd2_client_sim_module", bd2_client_sim_path)
-module = importlib.util.module_from_spec(spec)
-spec.loader.exec_module(module)
-BD2ClientSim = module.BD2ClientSim
+# HTML 报告模板（模块加载时创建一次）
+_REPORT_HEADER = string.Template("""
+        <!DOCTYPE html>
+        <html>
+        <head>
+            <meta charset="UTF-8">
+            <title>BD2 Load Test Report</title>
+            <style>
+                body { font-family: Arial, sans-serif; margin: 20px; }
+                table { border-collapse: collapse; width: 100%; }
+                th, td { border: 1px solid #ddd; padding: 8px; text-align: left; }
+                th { background-color: #f2f2f2; }
+                .success { color: green; }
+                .failed { color: red; }
+            </style>
+        </head>
+        <body>
+            <h1>BD2 Load Test Report</h1>
+            <p><strong>Test Start Time:</strong> $start_time</p>
+            <p><strong>Test End Time:</strong> $end_time</p>
+            <p><strong>Total Duration:</strong> $duration seconds</p>
+
+            <h2>Test Case Statistics</h2>
+            <table>
+                <tr>
+                    <th>Test Case</th>
+                    <th>Total Executions</th>
+                    <th>Success Count</th>
+                    <th>Failure Count</th>
+                    <th>Success Rate</th>
+                </tr>
+        """)
+
+_REPORT_ROW = """
+                <tr>
+                    <td>{case_name}</td>
+                    <td>{total}</td>
+                    <td class="success">{success}</td>
+                    <td class="failed">{failed}</td>
+                    <td>{success_rate:.2f}%</td>
+                </tr>
+                """
+
+_REPORT_EMPTY_ROW = """
+            <tr>
+                <td colspan="5" style="text-align:center;">No test data available</td>
+            </tr>
+            """
+
+_REPORT_FOOTER = """
+            </table>
+        </body>
+        </html>
+        """
+
+# 优先使用 libyaml 提供的 C 解析器，不可用时回退到纯 Python 实现
+_YAML_LOADER = getattr(yaml, 'CSafeLoader', yaml.SafeLoader)
+
+# 中断时等待工作线程退出的最长时间（秒）
+_WORKER_JOIN_TIMEOUT = 5.0
+
+# 方法名称格式：任务类型.动作
+_METHOD_PATTERN = re.compile(r'[^.\s]+\.[^.\s]+')
+
+# 测试用例必需字段
+_CASE_REQUIRED_FIELDS = ('name', 'method', 'weight')
+
+# 测试用例字段校验规则：(字段名, 校验函数, 错误信息模板)，字段不存在时跳过
+_CASE_FIELD_RULES = (
+    ('name', lambda v: isinstance(v, str),
+     "无效的任务名称: {}，必须是字符串"),
+    ('method', lambda v: isinstance(v, str) and _METHOD_PATTERN.fullmatch(v) is not None,
+     "无效的方法名称格式: {}，必须包含任务类型和动作，以点号分隔"),
+    ('weight', lambda v: isinstance(v, (int, float)) and v > 0,
+     "无效的权重值: {}"),
+    ('params', lambda v: isinstance(v, dict),
+     "无效的参数格式: {}"),
+)
+
+
+def _validate_test_cases(test_cases: Any):
+    """
+    按声明式规则校验测试用例列表，校验失败时抛出 ValueError
+    :param test_cases: 从 YAML 文件加载的原始数据
+    """
+    if not isinstance(test_cases, list):
+        raise ValueError("测试用例文件格式错误：应为列表格式")
+    
+    if not test_cases:
+        raise ValueError("测试用例文件中没有任何测试用例")
+    
+    for case in test_cases:
+        if not isinstance(case, dict):
+            raise ValueError("测试用例格式错误：应为字典格式")
+        
+        if not all(field in case for field in _CASE_REQUIRED_FIELDS):
+            raise ValueError("测试用例格式错误：缺少必要字段 'name'、'method' 或 'weight'")
+        
+        for field, check, message in _CASE_FIELD_RULES:
+            if field in case and not check(case[field]):
+                raise ValueError(message.format(case[field]))
+
+# 已校验测试用例及分发表缓存，键为 (绝对路径, st_mtime_ns, st_size)，文件变更后自动失效
+_YAML_CACHE: Dict[tuple, Tuple[List[Dict[str, Any]], List[tuple]]] = {}
 
 class LoadTest:
     """负载测试类"""
@@ -32,7 +136,11 @@ class LoadTest:
                  duration: Optional[int] = None,
                  uds_log: bool = False, 
                  ccs_log: bool = False, 
-                 log_level: str = None):
+                 log_level: str = None,
+                 stats_interval: float = 1.0,
+                 target_rps: Optional[float] = None,
+                 use_cache: bool = True,
+                 concurrency: int = 1):
         """
         初始化负载测试
         :param test_cases_file: 测试用例集文件路径
@@ -40,6 +148,10 @@ class LoadTest:
         :param uds_log: 是否启用 UDS 日志
         :param ccs_log: 是否启用 CCS 日志
         :param log_level: 日志级别
+        :param stats_interval: 打印统计信息的最小间隔（秒）
+        :param target_rps: 目标执行速率（次/秒），为 None 时不限速
+        :param use_cache: 是否复用已校验的测试用例缓存
+        :param concurrency: 并发执行测试用例的线程数
         """
         # 设置日志级别
         if log_level:
@@ -49,73 +161,86 @@ class LoadTest:
         self.logger = LoggerManager.get_logger(__file__)
         
         # 记录执行命令（如果是通过命令行调用）
-        if len(sys.argv) > 1:
-            cmd = subprocess.list2cmdline(sys.argv)
-            self.logger.info(f"执行命令: {cmd}")
+        if len(sys.argv) > 1 and self.logger.isEnabledFor(logging.INFO):
+            self.logger.info("执行命令: %s", subprocess.list2cmdline(sys.argv))
 
         # 保存参数
         self.test_cases_file = test_cases_file
         self.duration = duration
+        self.stats_interval = stats_interval
+        self.target_rps = target_rps
+        self.use_cache = use_cache
+        self.concurrency = concurrency
+        self._last_print = 0.0
+        self._slot = 0.0
+        self._next_slot = 0.0
+        
+        # 多线程执行时保护统计计数和限速时间槽
+        self._stats_lock = threading.Lock()
+        self._stop_event = threading.Event()
         self.start_time = None
         self.end_time = None
-        self.log_dir = LoggerManager.get_session_dir()
+        self._report_written = False
         
         # 初始化客户端
         self.client = BD2ClientSim(uds_log=uds_log, ccs_log=ccs_log, log_level=log_level)
         
-        # 加载测试用例
-        self.test_cases = self._load_test_cases()
+        # 会话目录在未启用文件日志时由客户端初始化时创建，因此在客户端创建后再获取
+        self.log_dir = LoggerManager.get_session_dir() or LoggerManager.create_session_dir()
+        os.makedirs(self.log_dir, exist_ok=True)
+        
+        # 加载测试用例及分发表：(名称, 任务类型, 动作, 参数)
+        self.test_cases, self._dispatch = self._load_test_cases()
+        
+        # 预先计算累计权重，用于按权重抽样测试用例
+        self._cum_weights = list(itertools.accumulate(case['weight'] for case in self.test_cases))
+        self._total_weight = self._cum_weights[-1]
+        
+        # 各用例执行计数，按用例在 self._dispatch 中的下标索引
+        case_count = len(self._dispatch)
+        self._total_counts = [0] * case_count
+        self._success_counts = [0] * case_count
+        self._failed_counts = [0] * case_count
         
         # 统计信息
         self.stats = {
             'total_cases': len(self.test_cases),
-            'case_stats': {},
             'start_time': None,
             'end_time': None,
             'total_duration': 0
         }
     
-    def _load_test_cases(self) -> List[Dict[str, Any]]:
+    def _load_test_cases(self) -> Tuple[List[Dict[str, Any]], List[tuple]]:
         """
-        加载测试用例
-        :return: 测试用例列表
+        加载并校验测试用例
+        :return: (测试用例列表, 分发表)
         """
         try:
+            st = os.stat(self.test_cases_file)
+            cache_key = (os.path.abspath(self.test_cases_file), st.st_mtime_ns, st.st_size)
+            cached = _YAML_CACHE.get(cache_key) if self.use_cache else None
+            if cached is not None:
+                # 缓存中的数据已在写入时校验，直接返回列表的浅拷贝
+                test_cases, dispatch = cached
+                return list(test_cases), list(dispatch)
+
             with open(self.test_cases_file, 'r', encoding='utf-8') as f:
-                test_cases = yaml.safe_load(f)
+                test_cases = yaml.load(f, Loader=_YAML_LOADER)
             
             # 验证测试用例格式
-            if not isinstance(test_cases, list):
-                raise ValueError("测试用例文件格式错误：应为列表格式")
+            _validate_test_cases(test_cases)
             
-            for case in test_cases:
-                if not isinstance(case, dict):
-                    raise ValueError("测试用例格式错误：应为字典格式")
-                
-                # 验证必需字段
-                if 'name' not in case or 'method' not in case or 'weight' not in case:
-                    raise ValueError("测试用例格式错误：缺少必要字段 'name'、'method' 或 'weight'")
-                
-                # 验证任务名称格式
-                if not isinstance(case['name'], str):
-                    raise ValueError(f"无效的任务名称: {case['name']}，必须是字符串")
-                
-                # 验证方法名称格式（必须包含一个点号，分隔任务类型和动作）
-                if '.' not in case['method']:
-                    raise ValueError(f"无效的方法名称格式: {case['method']}，必须包含任务类型和动作，以点号分隔")
-                
-                # 验证权重值
-                if not isinstance(case['weight'], (int, float)) or case['weight'] <= 0:
-                    raise ValueError(f"无效的权重值: {case['weight']}")
-                
-                # 验证可选参数
-                if 'params' in case and not isinstance(case['params'], dict):
-                    raise ValueError(f"无效的参数格式: {case['params']}")
+            # 预先拆分每个用例的热点字段：(名称, 任务类型, 动作, 参数)
+            dispatch = [
+                (case['name'], *case['method'].split('.', 1), case.get('params', {}))
+                for case in test_cases
+            ]
             
-            return test_cases
+            _YAML_CACHE[cache_key] = (test_cases, dispatch)
+            return list(test_cases), list(dispatch)
             
         except Exception as e:
-            self.logger.error(f"加载测试用例失败: {str(e)}")
+            self.logger.error("加载测试用例失败: %s", e)
             raise
     
     def _login_and_check_vehicle(self) -> bool:
@@ -129,14 +254,14 @@ class LoadTest:
             self.logger.info("开始登录流程")
             login_result = self.client.run_task('auth', 'login')
             if not login_result.get('success'):
-                self.logger.error(f"登录失败: {login_result.get('error')}")
+                self.logger.error("登录失败: %s", login_result.get('error'))
                 return False
             
             # 检查车辆状态
             self.logger.info("检查车辆状态")
             vehicle_result = self.client.run_task('auth', 'get_vehicle_st')
             if not vehicle_result.get('success'):
-                self.logger.error(f"车辆状态异常: {vehicle_result.get('error')}")
+                self.logger.error("车辆状态异常: %s", vehicle_result.get('error'))
                 return False
             
             self.logger.info("登录和车辆状态检查成功")
@@ -144,124 +269,93 @@ class LoadTest:
             return True
             
         except Exception as e:
-            self.logger.error(f"登录或检查车辆状态失败: {str(e)}")
+            self.logger.error("登录或检查车辆状态失败: %s", e)
             self.logger.info("############## 负载测试 tear up 失败，退出 ##############")
             return False
     
-    def _update_case_stats(self, case_name: str, success: bool):
+    def _update_case_stats(self, idx: int, success: bool):
         """
         更新测试用例统计信息
-        :param case_name: 测试用例名称
+        :param idx: 测试用例下标
         :param success: 是否成功
         """
-        if case_name not in self.stats['case_stats']:
-            self.stats['case_stats'][case_name] = {
-                'total': 0,
-                'success': 0,
-                'failed': 0
-            }
-        
-        stats = self.stats['case_stats'][case_name]
-        stats['total'] += 1
+        self._total_counts[idx] += 1
         if success:
-            stats['success'] += 1
+            self._success_counts[idx] += 1
         else:
-            stats['failed'] += 1
+            self._failed_counts[idx] += 1
+    
+    def _iter_case_stats(self):
+        """
+        遍历已执行过的测试用例统计信息
+        :return: (用例名称, 总执行次数, 成功次数, 失败次数, 成功率百分比) 迭代器
+        """
+        for (name, *_), total, success, failed in zip(
+                self._dispatch, self._total_counts, self._success_counts, self._failed_counts):
+            if total > 0:
+                yield name, total, success, failed, success * 100.0 / total
     
     def _print_stats(self):
         """打印统计信息"""
-        print("\n当前测试统计:")
-        print(f"总测试用例数: {self.stats['total_cases']}")
-        print("\n各用例执行情况:")
-        for case_name, stats in self.stats['case_stats'].items():
-            print(f"\n{case_name}:")
-            print(f"  总执行次数: {stats['total']}")
-            print(f"  成功次数: {stats['success']}")
-            print(f"  失败次数: {stats['failed']}")
-            if stats['total'] > 0:
-                success_rate = (stats['success'] / stats['total']) * 100
-                print(f"  成功率: {success_rate:.2f}%")
+        buf = [f"\n当前测试统计:\n总测试用例数: {self.stats['total_cases']}\n\n各用例执行情况:\n"]
+        for case_name, total, success, failed, success_rate in self._iter_case_stats():
+            buf.append(
+                f"\n{case_name}:\n"
+                f"  总执行次数: {total}\n"
+                f"  成功次数: {success}\n"
+                f"  失败次数: {failed}\n"
+                f"  成功率: {success_rate:.2f}%\n"
+            )
+        sys.stdout.write("".join(buf))
 
     def _generate_report(self):
         """Generate load test report"""
-        # Ensure the log directory exists
-        os.makedirs(self.log_dir, exist_ok=True)
+        # 报告只生成一次；测试未开始（如登录失败）时没有可报告的数据
+        if self._report_written or self.stats['start_time'] is None:
+            return
         
         report_file = os.path.join(self.log_dir, 'load_test_report.html')
 
-        # Test statistics
-        start_time = self.stats['start_time'].strftime('%Y-%m-%d %H:%M:%S')
-        end_time = self.stats['end_time'].strftime('%Y-%m-%d %H:%M:%S')
-        duration = self.stats['total_duration']
-
         # Generate HTML content
-        html_content = f"""
-        <!DOCTYPE html>
-        <html>
-        <head>
-            <meta charset="UTF-8">
-            <title>BD2 Load Test Report</title>
-            <style>
-                body {{ font-family: Arial, sans-serif; margin: 20px; }}
-                table {{ border-collapse: collapse; width: 100%; }}
-                th, td {{ border: 1px solid #ddd; padding: 8px; text-align: left; }}
-                th {{ background-color: #f2f2f2; }}
-                .success {{ color: green; }}
-                .failed {{ color: red; }}
-            </style>
-        </head>
-        <body>
-            <h1>BD2 Load Test Report</h1>
-            <p><strong>Test Start Time:</strong> {start_time}</p>
-            <p><strong>Test End Time:</strong> {end_time}</p>
-            <p><strong>Total Duration:</strong> {duration:.2f} seconds</p>
+        parts = [_REPORT_HEADER.substitute(
+            start_time=self.stats['start_time'].strftime('%Y-%m-%d %H:%M:%S'),
+            end_time=self.stats['end_time'].strftime('%Y-%m-%d %H:%M:%S'),
+            duration=f"{self.stats['total_duration']:.2f}"
+        )]
 
-            <h2>Test Case Statistics</h2>
-            <table>
-                <tr>
-                    <th>Test Case</th>
-                    <th>Total Executions</th>
-                    <th>Success Count</th>
-                    <th>Failure Count</th>
-                    <th>Success Rate</th>
-                </tr>
-        """
+        # 加锁读取统计计数，避免与仍在运行的工作线程交错更新
+        with self._stats_lock:
+            rows = [
+                _REPORT_ROW.format(
+                    case_name=case_name,
+                    total=total,
+                    success=success,
+                    failed=failed,
+                    success_rate=success_rate
+                )
+                for case_name, total, success, failed, success_rate in self._iter_case_stats()
+            ]
 
         # Check if there is any test data
-        if self.stats.get('case_stats'):
-            for case_name, stats in self.stats['case_stats'].items():
-                total = stats['total']
-                success = stats['success']
-                failed = stats['failed']
-                success_rate = (success / total) * 100 if total > 0 else 0
-
-                html_content += f"""
-                <tr>
-                    <td>{case_name}</td>
-                    <td>{total}</td>
-                    <td class="success">{success}</td>
-                    <td class="failed">{failed}</td>
-                    <td>{success_rate:.2f}%</td>
-                </tr>
-                """
+        if rows:
+            parts.extend(rows)
         else:
-            html_content += """
-            <tr>
-                <td colspan="5" style="text-align:center;">No test data available</td>
-            </tr>
-            """
+            parts.append(_REPORT_EMPTY_ROW)
 
-        html_content += """
-            </table>
-        </body>
-        </html>
-        """
+        parts.append(_REPORT_FOOTER)
 
-        # Write the report file
-        with open(report_file, 'w', encoding='utf-8') as f:
-            f.write(html_content)
+        # 一次性编码后用单次系统调用写入报告文件
+        data = memoryview("".join(parts).encode('utf-8'))
+        fd = os.open(report_file, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o644)
+        try:
+            while data:
+                # os.write 可能只写入部分数据，循环直到写完
+                data = data[os.write(fd, data):]
+        finally:
+            os.close(fd)
+        self._report_written = True
 
-        self.logger.info(f"Test report generated: {report_file}")
+        self.logger.info("Test report generated: %s", report_file)
 
 
     # def _generate_report(self):
@@ -323,6 +417,58 @@ class LoadTest:
         
     #     self.logger.info(f"测试报告已生成: {report_file}")
     
+    def _run_loop(self, deadline: float):
+        """
+        单个执行线程的测试循环，直到达到截止时间或收到停止信号
+        :param deadline: 截止时间（time.monotonic() 时间基准）
+        """
+        # 绑定为局部变量，减少热点循环中的属性查找
+        cum_weights = self._cum_weights
+        total_weight = self._total_weight
+        last_idx = len(cum_weights) - 1
+        dispatch = self._dispatch
+        lock = self._stats_lock
+        stop = self._stop_event
+        
+        # 热点循环中只在需要时才格式化日志
+        log_cases = self.logger.isEnabledFor(logging.INFO)
+        
+        while not stop.is_set():
+            # 检查是否达到测试时间
+            if time.monotonic() >= deadline:
+                break
+            
+            # 根据权重抽取一个测试用例（在累计权重上二分查找，
+            # 上界限定为最后一个下标，防止浮点舍入越界）
+            idx = bisect.bisect(cum_weights, random.random() * total_weight, 0, last_idx)
+            name, task_type, action, params = dispatch[idx]
+            
+            # 执行测试用例
+            if log_cases:
+                self.logger.info("执行测试用例: %s (%s.%s)", name, task_type, action)
+            
+            # 执行任务，传入可选参数
+            result = self.client.run_task(task_type, action, **params)
+            
+            with lock:
+                # 更新统计信息
+                self._update_case_stats(idx, result.get('success', False))
+                
+                # 打印统计信息（按间隔限频）
+                now = time.monotonic()
+                if now - self._last_print >= self.stats_interval:
+                    self._print_stats()
+                    self._last_print = now
+            
+            # 按目标速率限速（所有线程共享时间槽；落后于计划时不补发，避免突发请求）
+            if self._slot:
+                with lock:
+                    now = time.monotonic()
+                    self._next_slot = max(self._next_slot + self._slot, now)
+                    wait = self._next_slot - now
+                if wait > 0:
+                    stop.wait(wait)
+    
     def run(self):
         """运行负载测试"""
         try:
@@ -335,42 +481,41 @@ class LoadTest:
             self.start_time = datetime.now()
             self.stats['start_time'] = self.start_time
             
-            # 计算总权重
-            total_weight = sum(case['weight'] for case in self.test_cases)
+            # 预先计算截止时间（单调时钟），datetime 仅用于报告展示
+            deadline = time.monotonic() + self.duration if self.duration else math.inf
+            
+            # 限速：每次执行占用一个时间槽，只有超前于计划时才休眠
+            self._slot = 1.0 / self.target_rps if self.target_rps else 0.0
+            self._next_slot = time.monotonic()
+            self._stop_event.clear()
             
             # 开始测试循环
             self.logger.info("##########  开始负载测试 ##########")
-            while True:
-                # 检查是否达到测试时间
-                if self.duration and (datetime.now() - self.start_time).total_seconds() >= self.duration:
-                    break
-                
-                # 根据权重选择测试用例
-                for case in self.test_cases:
-                    # 检查是否达到测试时间
-                    if self.duration and (datetime.now() - self.start_time).total_seconds() >= self.duration:
-                        break
-                    
-                    # 根据权重决定是否执行
-                    if case['weight'] / total_weight > time.time() % 1:
-                        # 执行测试用例
-                        self.logger.info(f"执行测试用例: {case['name']} ({case['method']})")
-                        
-                        # 解析方法名称（格式：task_type.action）
-                        task_type, action = case['method'].split('.')
-                        
-                        # 执行任务，传入可选参数
-                        params = case.get('params', {})
-                        result = self.client.run_task(task_type, action, **params)
-                        
-                        # 更新统计信息
-                        self._update_case_stats(case['name'], result.get('success', False))
-                        
-                        # 打印统计信息
-                        self._print_stats()
-                
-                # 短暂休眠，避免过于频繁的执行
-                time.sleep(0.1)
+            if self.concurrency == 1:
+                self._run_loop(deadline)
+            else:
+                workers = [
+                    threading.Thread(target=self._run_loop, args=(deadline,),
+                                     name=f"load-worker-{i}", daemon=True)
+                    for i in range(self.concurrency)
+                ]
+                for worker in workers:
+                    worker.start()
+                try:
+                    for worker in workers:
+                        # 带超时等待，保证主线程能及时响应 KeyboardInterrupt
+                        while worker.is_alive():
+                            worker.join(0.5)
+                finally:
+                    # 通知所有工作线程在当前任务结束后退出，并在有限时间内等待它们结束
+                    self._stop_event.set()
+                    join_deadline = time.monotonic() + _WORKER_JOIN_TIMEOUT
+                    for worker in workers:
+                        worker.join(max(0.0, join_deadline - time.monotonic()))
+            
+            # 打印最终统计信息（加锁读取，超时未退出的工作线程可能仍在更新计数）
+            with self._stats_lock:
+                self._print_stats()
             
             # 记录结束时间
             self.end_time = datetime.now()
@@ -385,10 +530,16 @@ class LoadTest:
         except KeyboardInterrupt:
             self.logger.info("##########  负载测试被用户中断 ##########")
         except Exception as e:
-            self.logger.error(f"error: {str(e)}")
-            self.logger.error(f"##########  负载测试执行失败 ##########")
+            self.logger.error("error: %s", e)
+            self.logger.error("##########  负载测试执行失败 ##########")
         finally:
-            # 生成最终报告
+            # 中断或异常退出时补记结束时间
+            if self.start_time is not None and self.end_time is None:
+                self.end_time = datetime.now()
+                self.stats['end_time'] = self.end_time
+                self.stats['total_duration'] = (self.end_time - self.start_time).total_seconds()
+            
+            # 生成最终报告（正常结束时已生成，不会重复写入）
             self._generate_report()
 
 def main():
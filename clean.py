@@ -15,7 +15,38 @@
 import os
 import shutil
 import argparse
-from datetime import datetime, timedelta
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from datetime import date, datetime, timedelta
+
+# 需要整体删除的缓存目录名
+_CACHE_DIR_NAMES = frozenset(('__pycache__', '.pytest_cache', '.coverage', '.mypy_cache'))
+
+# 需要删除的缓存文件扩展名
+_CACHE_FILE_EXTS = frozenset(('.pyc', '.pyo', '.pyd'))
+
+# 日期解析缓存中标记“尚未解析”的哨兵对象
+_MISSING = object()
+
+def _is_date_name(name):
+    """
+    判断目录名是否为 YYYY-MM-DD 形式（只检查格式，不校验日期是否合法）
+    :param name: 目录名
+    :return: 格式是否匹配
+    """
+    return (len(name) == 10 and name[4] == '-' and name[7] == '-'
+            and name[:4].isdigit() and name[5:7].isdigit() and name[8:].isdigit())
+
+def _parse_dir_date(name):
+    """
+    解析 YYYY-MM-DD 格式的日期目录名（手动解析，比 strptime 更快）
+    :param name: 目录名
+    :return: 对应的 date 对象，格式无效时返回 None
+    """
+    try:
+        year, month, day = name.split('-')
+        return date(int(year), int(month), int(day))
+    except ValueError:
+        return None
 
 def clean_old_logs(base_dir, days=7):
     """
@@ -23,67 +54,134 @@ def clean_old_logs(base_dir, days=7):
     :param base_dir: 日志根目录
     :param days: 保留的天数
     """
-    cutoff_date = datetime.now() - timedelta(days=days)
+    cutoff_date = (datetime.now() - timedelta(days=days)).date()
+    cutoff_name = cutoff_date.isoformat()  # YYYY-MM-DD 的字典序与时间顺序一致
+    date_cache = {}  # 日期目录名 -> 解析后的 date，无效名称为 None
     
     try:
-        # 遍历日志根目录下的所有环境目录
-        for env_name in os.listdir(base_dir):
-            env_path = os.path.join(base_dir, env_name)
-            if not os.path.isdir(env_path):
-                continue
-                
-            # 遍历环境目录下的日期目录
-            for date_dir in os.listdir(env_path):
-                date_path = os.path.join(env_path, date_dir)
-                if not os.path.isdir(date_path):
+        # 遍历日志根目录下的所有环境目录（DirEntry 缓存了类型信息，无需额外 stat）
+        with os.scandir(base_dir) as env_entries:
+            for env_entry in env_entries:
+                if not env_entry.is_dir(follow_symlinks=False):
                     continue
-                    
-                try:
-                    # 将日期字符串转换为datetime对象
-                    dir_date = datetime.strptime(date_dir, "%Y-%m-%d")
-                    if dir_date < cutoff_date:
+                env_path = env_entry.path
+                
+                # 遍历环境目录下的日期目录，同时统计未被删除的条目数
+                remaining = 0
+                with os.scandir(env_path) as date_entries:
+                    for date_entry in date_entries:
+                        if not date_entry.is_dir(follow_symlinks=False):
+                            remaining += 1
+                            continue
+                        date_path = date_entry.path
+                        
+                        date_name = date_entry.name
+                        if not _is_date_name(date_name):
+                            print(f"跳过无效的日期目录: {date_path}")
+                            remaining += 1
+                            continue
+                        
+                        # 先按字符串比较，保留期内的目录无需构造 date 对象
+                        if date_name > cutoff_name:
+                            remaining += 1
+                            continue
+                        
+                        # 可能过期时再确认是合法日期；不同环境目录下的日期目录名大多相同，解析结果按名称缓存
+                        dir_date = date_cache.get(date_name, _MISSING)
+                        if dir_date is _MISSING:
+                            dir_date = date_cache[date_name] = _parse_dir_date(date_name)
+                        
+                        if dir_date is None:
+                            print(f"跳过无效的日期目录: {date_path}")
+                            remaining += 1
+                            continue
+                        
+                        # 单个目录删除失败时记录错误并继续清理其他目录
                         print(f"删除过期日志目录: {date_path}")
-                        shutil.rmtree(date_path)
-                except ValueError:
-                    print(f"跳过无效的日期目录: {date_path}")
-                    continue
-            
-            # 如果环境目录为空，也删除它
-            if not os.listdir(env_path):
-                print(f"删除空的环境目录: {env_path}")
-                os.rmdir(env_path)
+                        try:
+                            shutil.rmtree(date_path)
+                        except OSError as e:
+                            print(f"删除过期日志目录失败: {date_path}: {e}")
+                            remaining += 1
+                
+                # 如果环境目录已清空，也删除它
+                if remaining == 0:
+                    print(f"删除空的环境目录: {env_path}")
+                    try:
+                        os.rmdir(env_path)
+                    except OSError as e:
+                        print(f"删除空的环境目录失败: {env_path}: {e}")
                 
     except Exception as e:
         print(f"清理日志时发生错误: {str(e)}")
 
+def _scan_dir(path):
+    """
+    扫描单个目录，对条目分类（缓存目录本身不再深入遍历）
+    :param path: 要扫描的目录
+    :return: (待继续扫描的子目录路径列表, 缓存目录 DirEntry 列表, 缓存文件路径列表)
+    """
+    subdirs = []
+    cache_dirs = []
+    cache_files = []
+    # 单个目录无法读取时记录并跳过，不影响其他目录的清理
+    try:
+        with os.scandir(path) as entries:
+            for entry in entries:
+                name = entry.name
+                if entry.is_dir(follow_symlinks=False):
+                    if name in _CACHE_DIR_NAMES or name.endswith('.egg-info'):
+                        cache_dirs.append(entry)
+                    else:
+                        subdirs.append(entry.path)
+                elif os.path.splitext(name)[1] in _CACHE_FILE_EXTS:
+                    cache_files.append(entry.path)
+    except OSError as e:
+        print(f"跳过无法读取的目录: {path}: {e}")
+    return subdirs, cache_dirs, cache_files
+
+def _fast_rmtree(dir_entry):
+    """
+    基于 os.scandir 删除目录树，复用扫描时得到的 DirEntry 类型信息，无需额外 stat
+    :param dir_entry: 要删除的目录对应的 DirEntry
+    """
+    with os.scandir(dir_entry.path) as entries:
+        for entry in entries:
+            if entry.is_dir(follow_symlinks=False):
+                _fast_rmtree(entry)
+            else:
+                os.unlink(entry.path)
+    os.rmdir(dir_entry.path)
+
 def clean_python_cache(start_dir):
     """
     清除Python缓存文件
     :param start_dir: 开始清理的目录
     """
     try:
-        for root, dirs, files in os.walk(start_dir, topdown=True):
-            # 清理目录
-            dirs_to_remove = []
-            for dir_name in dirs:
-                if (dir_name == '__pycache__' or 
-                    dir_name.endswith('.egg-info') or 
-                    dir_name in ['.pytest_cache', '.coverage', '.mypy_cache']):
-                    dir_path = os.path.join(root, dir_name)
-                    print(f"删除缓存目录: {dir_path}")
-                    shutil.rmtree(dir_path)
-                    dirs_to_remove.append(dir_name)
-            
-            # 从dirs列表中移除已删除的目录，避免继续遍历它们
-            for dir_name in dirs_to_remove:
-                dirs.remove(dir_name)
+        # 遍历和删除都以系统调用为主，使用线程池并行执行：
+        # 每个目录的扫描作为一个任务，扫描结果中的子目录继续提交扫描，缓存条目提交删除
+        with ThreadPoolExecutor(max_workers=(os.cpu_count() or 1) * 4) as executor:
+            deletions = []
+            pending = {executor.submit(_scan_dir, start_dir)}
+            while pending:
+                done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                for future in done:
+                    subdirs, cache_dirs, cache_files = future.result()
+                    for dir_entry in cache_dirs:
+                        print(f"删除缓存目录: {dir_entry.path}")
+                        deletions.append(executor.submit(_fast_rmtree, dir_entry))
+                    for file_path in cache_files:
+                        print(f"删除缓存文件: {file_path}")
+                        deletions.append(executor.submit(os.remove, file_path))
+                    pending.update(executor.submit(_scan_dir, subdir) for subdir in subdirs)
             
-            # 清理文件
-            for file_name in files:
-                if file_name.endswith(('.pyc', '.pyo', '.pyd')):
-                    file_path = os.path.join(root, file_name)
-                    print(f"删除缓存文件: {file_path}")
-                    os.remove(file_path)
+            # 等待所有删除任务完成，单个删除失败时记录错误并继续
+            for future in deletions:
+                try:
+                    future.result()
+                except OSError as e:
+                    print(f"删除缓存失败: {e}")
     
     except Exception as e:
         print(f"清理Python缓存时发生错误: {str(e)}")
@@ -91,7 +189,8 @@ def clean_python_cache(start_dir):
 def main():
     """主函数"""
     # 解析命令行参数
-    parser = argparse.ArgumentParser(description="清理工具：清除指定天数前的日志和Python缓存文件")
+    parser = argparse.ArgumentParser(description="清理工具：清除指定天数前的日志和Python缓存文件",
+                                     allow_abbrev=False)
     parser.add_argument("--days", type=int, default=7,
                       help="清除多少天以前的日志（默认：7天）")
     args = parser.parse_args()
@@ -1,8 +1,13 @@
 import os
 import yaml
-from datetime import datetime
 from threading import Lock
 
+# 优先使用 libyaml 提供的 C 解析器，不可用时回退到纯 Python 实现
+_YAML_LOADER = getattr(yaml, "CSafeLoader", yaml.SafeLoader)
+
+# 标记 key 不存在的哨兵对象，用于区分值为 None 的配置项
+_MISSING = object()
+
 class ConfigLoader:
     """Singleton Configuration Loader for BD2 Client Simulator"""
 
@@ -23,6 +28,14 @@ class ConfigLoader:
         """Initialize configuration"""
         self.config_file = config_file
         self.config = self._load_config()
+        self._flat = {}  # 点分 key 查找结果缓存，配置加载后不再修改，缓存始终有效
+
+        # 将顶层配置提升为实例属性，CONFIG.xxx 直接命中实例字典，无需经过 __getattr__
+        # 与已有属性或方法同名的 key 跳过，仍可通过 get() 访问
+        if isinstance(self.config, dict):
+            for k, v in self.config.items():
+                if isinstance(k, str) and k not in self.__dict__ and not hasattr(type(self), k):
+                    setattr(self, k, v)
 
     def _load_config(self):
         """Load YAML configuration file."""
@@ -30,7 +43,7 @@ class ConfigLoader:
             raise FileNotFoundError(f"Configuration file not found: {self.config_file}")
 
         with open(self.config_file, "r", encoding="utf-8") as file:
-            return yaml.safe_load(file)
+            return yaml.load(file, Loader=_YAML_LOADER)
 
     def __getattr__(self, key):
         """
@@ -47,13 +60,27 @@ class ConfigLoader:
         :param default: Default value if key is not found
         :return: The value from config.yaml or default
         """
+        try:
+            value = self._flat[key]
+        except KeyError:
+            value = self._resolve(key)
+            self._flat[key] = value
+        return default if value is _MISSING else value
+
+    def _resolve(self, key):
+        """
+        Walk the config tree for a dotted key.
+
+        :param key: The key to resolve (e.g., "log.level")
+        :return: The value from config.yaml or _MISSING
+        """
         keys = key.split(".")  # 处理嵌套 key，如 log.level
         value = self.config
         for k in keys:
             if isinstance(value, dict) and k in value:
                 value = value[k]
             else:
-                return default  # key 不存在，返回默认值
+                return _MISSING  # key 不存在
         return value
 
 
@@ -92,7 +92,7 @@ def remove_personal_credentials(cred_manager):
         print(f"\n删除凭据时出错: {str(e)}")
 
 def main():
-    parser = argparse.ArgumentParser(description="BD2 Client 凭据管理工具")
+    parser = argparse.ArgumentParser(description="BD2 Client 凭据管理工具", allow_abbrev=False)
     parser.add_argument('action', choices=['show', 'set-project', 'set-personal', 'remove-project', 'remove-personal'], 
                        help='''操作类型：
                            show = 显示当前凭据信息
@@ -0,0 +1,58 @@
+"""
+Description: Tests for the bd2_load_test command line parser.
+
+Changelog:
+- 2026-10-16: Initial creation (nan/inf rejection for --target-rps and --stats-interval).
+"""
+
+import io
+import os
+import sys
+import unittest
+from contextlib import redirect_stderr
+from unittest import mock
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from utils.cli.bd2_load_test.cli_parser import CLIParser
+
+TEST_CASES_FILE = 'test_cases_001.yaml'
+
+
+class TestLoadTestCLIParser(unittest.TestCase):
+
+    def _parse(self, *options):
+        """使用指定选项解析命令行，返回 (参数字典或退出码, 错误输出)"""
+        argv = ['bd2_load_test.py', TEST_CASES_FILE, *options]
+        stderr = io.StringIO()
+        with mock.patch.object(sys, 'argv', argv), redirect_stderr(stderr):
+            try:
+                return CLIParser.parse_args(), stderr.getvalue()
+            except SystemExit as e:
+                return e.code, stderr.getvalue()
+
+    def test_target_rps_accepts_positive_number(self):
+        args, _ = self._parse('--target-rps', '5')
+        self.assertEqual(args['target_rps'], 5.0)
+
+    def test_target_rps_rejects_nan_and_inf(self):
+        for value in ('nan', 'inf', '-inf', '0'):
+            with self.subTest(value=value):
+                code, err = self._parse('--target-rps', value)
+                self.assertEqual(code, 1)
+                self.assertIn("--target-rps 必须是正数", err)
+
+    def test_stats_interval_accepts_zero(self):
+        args, _ = self._parse('--stats-interval', '0')
+        self.assertEqual(args['stats_interval'], 0.0)
+
+    def test_stats_interval_rejects_nan_and_inf(self):
+        for value in ('nan', 'inf', '-1'):
+            with self.subTest(value=value):
+                code, err = self._parse('--stats-interval', value)
+                self.assertEqual(code, 1)
+                self.assertIn("--stats-interval 必须是非负数", err)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -1,14 +1,11 @@
 import sys
-from utils.cli.bd2_client_sim.cli_parser import CLIParser as ClientSimCLIParser
-from utils.cli.bd2_load_test.cli_parser import CLIParser as LoadTestCLIParser
 from utils.cli.factory import CLIParserFactory
 
 class CLIParser:
     @staticmethod
     def parse_args():
-        # 根据脚本名称自动选择正确的解析器
-        script_name = sys.argv[0].split('/')[-1]
-        parser = CLIParserFactory.get_parser(script_name)
+        # 根据脚本名称自动选择正确的解析器（工厂内部会用 os.path.basename 去除路径）
+        parser = CLIParserFactory.get_parser(sys.argv[0])
         return parser.parse_args()
 
 # 导出与原来相同的接口
@@ -1,8 +1,69 @@
-import click
 import sys
 from typing import Optional, Tuple, Dict, Any
 from enum import Enum
 
+# 主帮助信息
+_HELP = """
+用法: bd2_client_sim.py <task_type> <action> [<args>] [--uds-log] [--ccs-log] [--log-level]
+
+BD2 Client Simulator CLI
+
+必选参数:
+  <task_type>    任务类型 (auth, cert, diag)
+  <action>      具体操作（使用 -h 查看每个任务类型的可用操作）
+
+可选参数:
+  -h, --help    显示帮助信息
+  --uds-log     UDS 日志开关 (on/off)
+  --ccs-log      CCS 日志开关 (on/off)
+  --log-level   设置日志级别 (DEBUG, INFO, WARNING, ERROR, CRITICAL)
+
+示例:
+    bd2_client_sim.py auth login --uds-log on              # 执行登录操作并启用UDS日志
+    bd2_client_sim.py cert deploy -ecu ccc --ccs-log on     # 部署证书到CCC并启用CCS日志
+    bd2_client_sim.py diag run                             # 运行诊断
+"""
+
+# 错误信息模板
+_ERR_INVALID_TASK = "错误: 无效的任务类型 '%s'\n可用的任务类型: %s\n"
+_ERR_MISSING_ACTION = ("错误: 缺少动作参数\n"
+                       "用法: bd2_client_sim.py %s <action> [<args>] [--uds-log] [--ccs-log] [--log-level]\n")
+_ERR_INVALID_ACTION = "错误: 无效的动作 '%s'\n可用的动作: %s\n"
+_ERR_INVALID_ECU = "错误: -ecu 的值必须是 %s\n"
+
+# 参数取值集合
+_LOG_LEVELS = frozenset(('DEBUG', 'INFO', 'WARNING', 'ERROR', 'CRITICAL'))
+_ON_OFF = frozenset(('on', 'off'))
+_HELP_FLAGS = frozenset(('-h', '--help'))
+
+
+def _to_on_off(value: str) -> bool:
+    """将 on/off（不区分大小写）转换为布尔值"""
+    value = value.lower()
+    if value not in _ON_OFF:
+        raise ValueError()
+    return value == 'on'
+
+
+def _to_log_level(value: str) -> str:
+    """校验日志级别"""
+    if value not in _LOG_LEVELS:
+        raise ValueError()
+    return value
+
+
+# 带值参数分发表：参数名 -> (结果键, 转换函数, 缺少值时的错误信息, 值无效时的错误信息)
+_VALUE_OPTIONS = {
+    '--uds-log': ('uds_log', _to_on_off,
+                  "--uds-log 需要一个值 (on/off)", "--uds-log 的值必须是 on 或 off"),
+    '--ccs-log': ('ccs_log', _to_on_off,
+                  "--ccs-log 需要一个值 (on/off)", "--ccs-log 的值必须是 on 或 off"),
+    '--log-level': ('log_level', _to_log_level,
+                    "--log-level 需要一个值",
+                    "--log-level 的值必须是 DEBUG, INFO, WARNING, ERROR, 或 CRITICAL"),
+}
+
+
 class TaskType(str, Enum):
     AUTH = "auth"
     CERT = "cert"
@@ -22,6 +83,9 @@ class CertAction(str, Enum):
 class DiagAction(str, Enum):
     RUN = "run"
 
+# 合法的任务类型
+_TASK_TYPES = frozenset(t.value for t in TaskType)
+
 class GetEcuType(str, Enum):
     ADF = "adf"
     CDF = "cdf"
@@ -45,159 +109,38 @@ class RevokeEcuType(str, Enum):
     ZONE_FRONT = "zone_front"
     ZONE_REAR = "zone_rear"
 
-class CLIParser:
-    """BD2 Client Simulator CLI Parser"""
-
-    @staticmethod
-    def parse_args() -> Optional[Tuple[str, str, Dict[str, Any]]]:
-        """
-        解析命令行参数
-        返回: (task_type, action, args) 或 None（如果解析失败）
-        """
-        try:
-            # 确保至少有一个参数（程序名）
-            if len(sys.argv) < 2:
-                CLIParser._show_help()
-                sys.exit(0)  # 正常退出，不返回 None
-
-            # 获取任务类型
-            task_type = sys.argv[1]
-            if task_type in ['-h', '--help']:
-                CLIParser._show_help()
-                sys.exit(0)  # 正常退出，不返回 None
-
-            if task_type not in [t.value for t in TaskType]:
-                click.echo(f"错误: 无效的任务类型 '{task_type}'")
-                click.echo("可用的任务类型: " + ", ".join(t.value for t in TaskType))
-                sys.exit(1)  # 错误退出
-
-            # 获取动作
-            if len(sys.argv) < 3:
-                click.echo(f"错误: 缺少动作参数")
-                click.echo(f"用法: bd2_client_sim.py {task_type} <action> [<args>] [--uds-log] [--ccs-log] [--log-level]")
-                sys.exit(1)  # 错误退出
-
-            action = sys.argv[2]
-            if action in ['-h', '--help']:
-                CLIParser._show_task_help(task_type)
-                sys.exit(0)  # 正常退出，不返回 None
-
-            # 验证动作是否有效
-            valid_actions = {
-                TaskType.AUTH: [a.value for a in AuthAction],
-                TaskType.CERT: [a.value for a in CertAction],
-                TaskType.DIAG: [a.value for a in DiagAction]
-            }
-            if action not in valid_actions[TaskType(task_type)]:
-                click.echo(f"错误: 无效的动作 '{action}'")
-                click.echo(f"可用的动作: " + ", ".join(valid_actions[TaskType(task_type)]))
-                sys.exit(1)  # 错误退出
-
-            # 解析其他参数
-            args = {}
-            i = 3
-            while i < len(sys.argv):
-                arg = sys.argv[i]
-                
-                # 处理可选参数
-                if arg in ['--uds-log', '--ccs-log']:
-                    if i + 1 >= len(sys.argv):
-                        click.echo(f"错误: {arg} 需要一个值 (on/off)")
-                        sys.exit(1)
-                    value = sys.argv[i + 1].lower()
-                    if value not in ['on', 'off']:
-                        click.echo(f"错误: {arg} 的值必须是 on 或 off")
-                        sys.exit(1)
-                    args[arg[2:].replace('-', '_')] = (value == 'on')
-                    i += 2
-                elif arg == '--log-level':
-                    if i + 1 >= len(sys.argv):
-                        click.echo("错误: --log-level 需要一个值")
-                        sys.exit(1)  # 错误退出
-                    value = sys.argv[i + 1]
-                    if value not in ['DEBUG', 'INFO', 'WARNING', 'ERROR', 'CRITICAL']:
-                        click.echo("错误: --log-level 的值必须是 DEBUG, INFO, WARNING, ERROR, 或 CRITICAL")
-                        sys.exit(1)  # 错误退出
-                    args['log_level'] = value
-                    i += 2
-                # 处理必选参数
-                elif arg == '-ecu':
-                    if i + 1 >= len(sys.argv):
-                        click.echo("错误: -ecu 需要一个值")
-                        sys.exit(1)  # 错误退出
-                    value = sys.argv[i + 1]
-                    if task_type == TaskType.CERT.value:
-                        if action == CertAction.DEPLOY.value:
-                            if value not in [e.value for e in DeployEcuType]:
-                                click.echo(f"错误: -ecu 的值必须是 {', '.join(e.value for e in DeployEcuType)}")
-                                sys.exit(1)  # 错误退出
-                        elif action == CertAction.REVOKE.value:
-                            if value not in [e.value for e in RevokeEcuType]:
-                                click.echo(f"错误: -ecu 的值必须是 {', '.join(e.value for e in RevokeEcuType)}")
-                                sys.exit(1)  # 错误退出
-                        elif action == CertAction.GET_CERT_ST.value:
-                            if value not in [e.value for e in GetEcuType if e != GetEcuType.ALL]:
-                                click.echo(f"错误: -ecu 的值必须是 {', '.join(e.value for e in GetEcuType if e != GetEcuType.ALL)}")
-                                sys.exit(1)  # 错误退出
-                    args['ecu'] = value
-                    i += 2
-                elif arg in ['-h', '--help']:
-                    CLIParser._show_action_help(task_type, action)
-                    sys.exit(0)  # 正常退出，不返回 None
-                else:
-                    click.echo(f"错误: 未知的参数 '{arg}'")
-                    sys.exit(1)  # 错误退出
-
-            # 验证必选参数
-            if task_type == TaskType.CERT.value:
-                if action in [CertAction.DEPLOY.value, CertAction.REVOKE.value]:
-                    if 'ecu' not in args:
-                        click.echo(f"错误: {action} 操作需要 -ecu 参数")
-                        sys.exit(1)  # 错误退出
-                    if action == CertAction.DEPLOY.value:
-                        if args['ecu'] not in [e.value for e in DeployEcuType]:
-                            click.echo(f"错误: -ecu 的值必须是 {', '.join(e.value for e in DeployEcuType)}")
-                            sys.exit(1)  # 错误退出
-                    elif action == CertAction.REVOKE.value:
-                        if args['ecu'] not in [e.value for e in RevokeEcuType]:
-                            click.echo(f"错误: -ecu 的值必须是 {', '.join(e.value for e in RevokeEcuType)}")
-                            sys.exit(1)  # 错误退出
-
-            return task_type, action, args
-
-        except Exception as e:
-            click.echo(f"错误: {str(e)}")
-            sys.exit(1)  # 错误退出
-
-    @staticmethod
-    def _show_help():
-        """显示主帮助信息"""
-        click.echo("""
-用法: bd2_client_sim.py <task_type> <action> [<args>] [--uds-log] [--ccs-log] [--log-level]
-
-BD2 Client Simulator CLI
-
-必选参数:
-  <task_type>    任务类型 (auth, cert, diag)
-  <action>      具体操作（使用 -h 查看每个任务类型的可用操作）
-
-可选参数:
-  -h, --help    显示帮助信息
-  --uds-log     UDS 日志开关 (on/off)
-  --ccs-log      CCS 日志开关 (on/off)
-  --log-level   设置日志级别 (DEBUG, INFO, WARNING, ERROR, CRITICAL)
-
-示例:
-    bd2_client_sim.py auth login --uds-log on              # 执行登录操作并启用UDS日志
-    bd2_client_sim.py cert deploy -ecu ccc --ccs-log on     # 部署证书到CCC并启用CCS日志
-    bd2_client_sim.py diag run                             # 运行诊断
-""")
-
-    @staticmethod
-    def _show_task_help(task_type: str):
-        """显示特定任务类型的帮助信息"""
-        task_helps = {
-            TaskType.AUTH.value: """
+# 各任务类型对应的动作枚举及合法取值
+_TASK_ACTIONS = {
+    TaskType.AUTH.value: AuthAction,
+    TaskType.CERT.value: CertAction,
+    TaskType.DIAG.value: DiagAction,
+}
+_VALID_ACTIONS = {task: frozenset(a.value for a in actions) for task, actions in _TASK_ACTIONS.items()}
+
+# 各证书动作允许的 ECU 取值
+_DEPLOY_ECUS = frozenset(e.value for e in DeployEcuType)
+_REVOKE_ECUS = frozenset(e.value for e in RevokeEcuType)
+_GET_CERT_ECUS = frozenset(e.value for e in GetEcuType if e != GetEcuType.ALL)
+
+# 错误信息中列出的取值（按枚举定义顺序）
+_TASK_TYPES_STR = ', '.join(t.value for t in TaskType)
+_VALID_ACTIONS_STR = {task: ', '.join(a.value for a in actions) for task, actions in _TASK_ACTIONS.items()}
+_DEPLOY_ECUS_STR = ', '.join(e.value for e in DeployEcuType)
+_REVOKE_ECUS_STR = ', '.join(e.value for e in RevokeEcuType)
+_GET_CERT_ECUS_STR = ', '.join(e.value for e in GetEcuType if e != GetEcuType.ALL)
+
+# 证书动作 -> (允许的 ECU 取值, 错误信息中列出的取值)
+_CERT_ECU_RULES = {
+    CertAction.DEPLOY.value: (_DEPLOY_ECUS, _DEPLOY_ECUS_STR),
+    CertAction.REVOKE.value: (_REVOKE_ECUS, _REVOKE_ECUS_STR),
+    CertAction.GET_CERT_ST.value: (_GET_CERT_ECUS, _GET_CERT_ECUS_STR),
+}
+# 必须指定 -ecu 的证书动作
+_ECU_REQUIRED_ACTIONS = frozenset((CertAction.DEPLOY.value, CertAction.REVOKE.value))
+
+# 各任务类型的帮助信息
+_TASK_HELPS = {
+    TaskType.AUTH.value: """
 用法: bd2_client_sim.py auth <action> [<args>] [--uds-log] [--ccs-log] [--log-level]
 
 可用的认证操作:
@@ -209,7 +152,7 @@ BD2 Client Simulator CLI
     bd2_client_sim.py auth login --uds-log on              # 执行登录操作并启用UDS日志
     bd2_client_sim.py auth get_login_st                    # 检查登录状态
 """,
-            TaskType.CERT.value: """
+    TaskType.CERT.value: """
 用法: bd2_client_sim.py cert <action> [<args>] [--uds-log] [--ccs-log] [--log-level]
 
 可用的证书操作:
@@ -224,7 +167,7 @@ BD2 Client Simulator CLI
     bd2_client_sim.py cert revoke -ecu zone_fte         # 撤销ZONE_FTE证书
     bd2_client_sim.py cert get_cert_st -ecu saf         # 获取SAF的证书状态
 """,
-            TaskType.DIAG.value: """
+    TaskType.DIAG.value: """
 用法: bd2_client_sim.py diag <action> [<args>] [--uds-log] [--ccs-log] [--log-level]
 
 可用的诊断操作:
@@ -233,14 +176,11 @@ BD2 Client Simulator CLI
 示例:
     bd2_client_sim.py diag run --uds-log on              # 运行诊断并启用UDS日志
 """
-        }
-        click.echo(task_helps.get(task_type, "未知的任务类型"))
+}
 
-    @staticmethod
-    def _show_action_help(task_type: str, action: str):
-        """显示特定动作的帮助信息"""
-        action_helps = {
-            (TaskType.AUTH.value, AuthAction.LOGIN.value): """
+# 各动作的帮助信息
+_ACTION_HELPS = {
+    (TaskType.AUTH.value, AuthAction.LOGIN.value): """
 用法: bd2_client_sim.py auth login [<args>] [--uds-log] [--ccs-log] [--log-level]
 
 执行用户登录操作
@@ -249,7 +189,7 @@ BD2 Client Simulator CLI
     bd2_client_sim.py auth login                          # 使用默认配置登录
     bd2_client_sim.py auth login --uds-log on --ccs-log on # 启用所有日志
 """,
-            (TaskType.AUTH.value, AuthAction.GET_LOGIN_ST.value): """
+    (TaskType.AUTH.value, AuthAction.GET_LOGIN_ST.value): """
 用法: bd2_client_sim.py auth get_login_st [<args>] [--uds-log] [--ccs-log] [--log-level]
 
 检查当前用户的登录状态
@@ -257,7 +197,7 @@ BD2 Client Simulator CLI
 示例:
     bd2_client_sim.py auth get_login_st                   # 检查登录状态
 """,
-            (TaskType.AUTH.value, AuthAction.GET_VEHICLE_ST.value): """
+    (TaskType.AUTH.value, AuthAction.GET_VEHICLE_ST.value): """
 用法: bd2_client_sim.py auth get_vehicle_st [<args>] [--uds-log] [--ccs-log] [--log-level]
 
 获取车辆的状态信息
@@ -265,7 +205,7 @@ BD2 Client Simulator CLI
 示例:
     bd2_client_sim.py auth get_vehicle_st                 # 获取车辆状态
 """,
-            (TaskType.CERT.value, CertAction.INIT.value): """
+    (TaskType.CERT.value, CertAction.INIT.value): """
 用法: bd2_client_sim.py cert init [<args>] [--uds-log] [--ccs-log] [--log-level]
 
 初始化证书功能
@@ -273,7 +213,7 @@ BD2 Client Simulator CLI
 示例:
     bd2_client_sim.py cert init                          # 初始化证书功能
 """,
-            (TaskType.CERT.value, CertAction.DEPLOY.value): """
+    (TaskType.CERT.value, CertAction.DEPLOY.value): """
 用法: bd2_client_sim.py cert deploy -ecu <type> [<args>] [--uds-log] [--ccs-log] [--log-level]
 
 部署证书到指定 ECU
@@ -285,7 +225,7 @@ BD2 Client Simulator CLI
     bd2_client_sim.py cert deploy -ecu ccc               # 部署到 CCC
     bd2_client_sim.py cert deploy -ecu all --ccs-log on   # 部署到所有 ECU 并启用CCS日志
 """,
-            (TaskType.CERT.value, CertAction.REVOKE.value): """
+    (TaskType.CERT.value, CertAction.REVOKE.value): """
 用法: bd2_client_sim.py cert revoke -ecu <type> [<args>] [--uds-log] [--ccs-log] [--log-level]
 
 撤销指定 ECU 的证书
@@ -297,7 +237,7 @@ BD2 Client Simulator CLI
     bd2_client_sim.py cert revoke -ecu vdf_mcore        # 撤销 VDF_MCORE 证书
     bd2_client_sim.py cert revoke -ecu zone_fte         # 撤销 ZONE_FTE 证书
 """,
-            (TaskType.CERT.value, CertAction.GET_CERT_ST.value): """
+    (TaskType.CERT.value, CertAction.GET_CERT_ST.value): """
 用法: bd2_client_sim.py cert get_cert_st [-ecu <type>] [--uds-log] [--ccs-log] [--log-level]
 
 获取证书状态信息
@@ -311,7 +251,7 @@ BD2 Client Simulator CLI
     bd2_client_sim.py cert get_cert_st -ecu saf         # 获取 SAF 的证书状态
     bd2_client_sim.py cert get_cert_st -ecu vdf_mcore   # 获取 VDF_MCORE 的证书状态
 """,
-            (TaskType.DIAG.value, DiagAction.RUN.value): """
+    (TaskType.DIAG.value, DiagAction.RUN.value): """
 用法: bd2_client_sim.py diag run [<args>] [--uds-log] [--ccs-log] [--log-level]
 
 运行诊断任务
@@ -320,9 +260,127 @@ BD2 Client Simulator CLI
     bd2_client_sim.py diag run                          # 运行诊断
     bd2_client_sim.py diag run --uds-log on            # 运行诊断并启用UDS日志
 """
-        }
-        help_text = action_helps.get((task_type, action))
+}
+
+# 解析结果缓存：tuple(sys.argv) -> (task_type, action, args)
+_PARSE_CACHE: Dict[Tuple[str, ...], Tuple[str, str, Dict[str, Any]]] = {}
+
+class CLIParser:
+    """BD2 Client Simulator CLI Parser"""
+
+    @staticmethod
+    def parse_args() -> Optional[Tuple[str, str, Dict[str, Any]]]:
+        """
+        解析命令行参数
+        返回: (task_type, action, args) 或 None（如果解析失败）
+        """
+        try:
+            # 绑定为局部变量，避免循环中反复访问 sys.argv
+            argv = sys.argv
+            argc = len(argv)
+
+            # 相同命令行已解析过时直接复用结果（返回参数字典的副本）
+            cache_key = tuple(argv)
+            cached = _PARSE_CACHE.get(cache_key)
+            if cached is not None:
+                task_type, action, args = cached
+                return task_type, action, dict(args)
+            
+            # 确保至少有一个参数（程序名）
+            if argc < 2:
+                CLIParser._show_help()
+                sys.exit(0)  # 正常退出，不返回 None
+
+            # 获取任务类型
+            task_type = argv[1]
+            if task_type in _HELP_FLAGS:
+                CLIParser._show_help()
+                sys.exit(0)  # 正常退出，不返回 None
+
+            if task_type not in _TASK_TYPES:
+                sys.stderr.write(_ERR_INVALID_TASK % (task_type, _TASK_TYPES_STR))
+                sys.exit(1)  # 错误退出
+
+            # 获取动作
+            if argc < 3:
+                sys.stderr.write(_ERR_MISSING_ACTION % task_type)
+                sys.exit(1)  # 错误退出
+
+            action = argv[2]
+            if action in _HELP_FLAGS:
+                CLIParser._show_task_help(task_type)
+                sys.exit(0)  # 正常退出，不返回 None
+
+            # 验证动作是否有效
+            if action not in _VALID_ACTIONS[task_type]:
+                sys.stderr.write(_ERR_INVALID_ACTION % (action, _VALID_ACTIONS_STR[task_type]))
+                sys.exit(1)  # 错误退出
+
+            # 解析其他参数（通过迭代器逐个消费参数及其取值）
+            args = {}
+            remaining = iter(argv[3:])
+            for arg in remaining:
+                # 处理可选参数
+                spec = _VALUE_OPTIONS.get(arg)
+                if spec is not None:
+                    key, convert, missing_msg, invalid_msg = spec
+                    value = next(remaining, None)
+                    if value is None:
+                        sys.stderr.write(f"错误: {missing_msg}\n")
+                        sys.exit(1)  # 错误退出
+                    try:
+                        args[key] = convert(value)
+                    except ValueError:
+                        sys.stderr.write(f"错误: {invalid_msg}\n")
+                        sys.exit(1)  # 错误退出
+                # 处理必选参数
+                elif arg == '-ecu':
+                    value = next(remaining, None)
+                    if value is None:
+                        sys.stderr.write("错误: -ecu 需要一个值\n")
+                        sys.exit(1)  # 错误退出
+                    args['ecu'] = value
+                elif arg in _HELP_FLAGS:
+                    CLIParser._show_action_help(task_type, action)
+                    sys.exit(0)  # 正常退出，不返回 None
+                else:
+                    sys.stderr.write(f"错误: 未知的参数 '{arg}'\n")
+                    sys.exit(1)  # 错误退出
+
+            # 验证必选参数及 ECU 取值
+            if task_type == TaskType.CERT.value:
+                if action in _ECU_REQUIRED_ACTIONS and 'ecu' not in args:
+                    sys.stderr.write(f"错误: {action} 操作需要 -ecu 参数\n")
+                    sys.exit(1)  # 错误退出
+                rule = _CERT_ECU_RULES.get(action)
+                if rule is not None and 'ecu' in args:
+                    allowed, allowed_str = rule
+                    if args['ecu'] not in allowed:
+                        sys.stderr.write(_ERR_INVALID_ECU % allowed_str)
+                        sys.exit(1)  # 错误退出
+
+            _PARSE_CACHE[cache_key] = (task_type, action, dict(args))
+            return task_type, action, args
+
+        except (IndexError, ValueError, KeyError) as e:
+            sys.stderr.write(f"错误: {str(e)}\n")
+            sys.exit(1)  # 错误退出
+
+    @staticmethod
+    def _show_help():
+        """显示主帮助信息"""
+        sys.stdout.write(_HELP)
+
+    @staticmethod
+    def _show_task_help(task_type: str):
+        """显示特定任务类型的帮助信息"""
+        sys.stdout.write(_TASK_HELPS.get(task_type, "未知的任务类型") + "\n")
+
+    @staticmethod
+    def _show_action_help(task_type: str, action: str):
+        """显示特定动作的帮助信息"""
+        help_text = _ACTION_HELPS.get((task_type, action))
         if help_text:
-            click.echo(help_text)
+            sys.stdout.write(help_text + "\n")
         else:
-            click.echo(f"未知的操作: {task_type} {action}")
+            sys.stdout.write(f"未知的操作: {task_type} {action}\n")
@@ -5,9 +5,131 @@ BD2 负载测试命令行参数解析器
 
 import os
 import sys
-import click
+import math
 from typing import Dict, Any
 
+# 帮助信息
+_HELP = """
+用法: bd2_load_test.py <测试用例文件> [选项]
+
+BD2 负载测试工具
+
+参数:
+  测试用例文件            YAML格式的测试用例文件（必需）
+
+选项:
+  -t, --time <分钟>     测试持续时间（分钟）
+  --uds-log on|off      启用/禁用 UDS 日志
+  --ccs-log on|off      启用/禁用 CCS 日志
+  --log-level LEVEL     设置日志级别 (DEBUG, INFO, WARNING, ERROR, CRITICAL)
+  --stats-interval <秒> 统计信息打印间隔（秒，默认 1，0 表示每次执行后都打印）
+  --target-rps <次/秒>  目标执行速率（默认不限速）
+  --concurrency <N>     并发执行测试用例的线程数（默认 1）
+  --no-cache            不使用测试用例缓存，每次重新加载并校验 YAML
+  -h, --help            显示帮助信息
+
+示例:
+  # 基本用法（必需参数）
+  bd2_load_test.py load_test_cases_001.yaml
+
+  # 设置测试时间（例如运行 60 分钟）
+  bd2_load_test.py load_test_cases_001.yaml -t 60
+
+  # 启用 UDS 日志和 CCS 日志
+  bd2_load_test.py load_test_cases_001.yaml --uds-log on --ccs-log on
+
+  # 设置日志级别
+  bd2_load_test.py load_test_cases_001.yaml --log-level DEBUG
+
+  # 限制执行速率为每秒 5 次
+  bd2_load_test.py load_test_cases_001.yaml --target-rps 5
+
+  # 使用 8 个线程并发执行
+  bd2_load_test.py load_test_cases_001.yaml --concurrency 8
+
+  # 组合使用
+  bd2_load_test.py load_test_cases_001.yaml -t 60 --uds-log on --ccs-log on --log-level DEBUG
+"""
+
+# 参数取值集合
+_LOG_LEVELS = frozenset(('DEBUG', 'INFO', 'WARNING', 'ERROR', 'CRITICAL'))
+_ON_OFF = frozenset(('on', 'off'))
+_HELP_FLAGS = frozenset(('-h', '--help'))
+
+
+def _to_seconds_from_minutes(value: str) -> int:
+    """将正整数分钟数转换为秒"""
+    minutes = int(value)
+    if minutes <= 0:
+        raise ValueError()
+    return minutes * 60
+
+
+def _to_on_off(value: str) -> bool:
+    """将 on/off 转换为布尔值"""
+    if value not in _ON_OFF:
+        raise ValueError()
+    return value == 'on'
+
+
+def _to_log_level(value: str) -> str:
+    """校验日志级别"""
+    if value not in _LOG_LEVELS:
+        raise ValueError()
+    return value
+
+
+def _to_non_negative_float(value: str) -> float:
+    """转换为非负浮点数（拒绝 nan/inf）"""
+    number = float(value)
+    if not math.isfinite(number) or number < 0:
+        raise ValueError()
+    return number
+
+
+def _to_positive_float(value: str) -> float:
+    """转换为正浮点数（拒绝 nan/inf）"""
+    number = float(value)
+    if not math.isfinite(number) or number <= 0:
+        raise ValueError()
+    return number
+
+
+def _to_positive_int(value: str) -> int:
+    """转换为正整数"""
+    number = int(value)
+    if number <= 0:
+        raise ValueError()
+    return number
+
+
+# 带值参数分发表：参数名 -> (结果键, 转换函数, 缺少值时的错误信息, 值无效时的错误信息)
+_TIME_OPTION = ('duration', _to_seconds_from_minutes,
+                "-t/--time 需要一个值", "-t/--time 必须是正整数（分钟）")
+_VALUE_OPTIONS = {
+    '-t': _TIME_OPTION,
+    '--time': _TIME_OPTION,
+    '--uds-log': ('uds_log', _to_on_off,
+                  "--uds-log 需要一个值 (on/off)", "--uds-log 的值必须是 on 或 off"),
+    '--ccs-log': ('ccs_log', _to_on_off,
+                  "--ccs-log 需要一个值 (on/off)", "--ccs-log 的值必须是 on 或 off"),
+    '--log-level': ('log_level', _to_log_level,
+                    "--log-level 需要一个值",
+                    "--log-level 的值必须是 DEBUG, INFO, WARNING, ERROR, 或 CRITICAL"),
+    '--stats-interval': ('stats_interval', _to_non_negative_float,
+                         "--stats-interval 需要一个值", "--stats-interval 必须是非负数（秒）"),
+    '--target-rps': ('target_rps', _to_positive_float,
+                     "--target-rps 需要一个值", "--target-rps 必须是正数（次/秒）"),
+    '--concurrency': ('concurrency', _to_positive_int,
+                      "--concurrency 需要一个值", "--concurrency 必须是正整数"),
+}
+
+# 开关参数分发表：参数名 -> (结果键, 设置的值)
+_FLAG_OPTIONS = {
+    '--no-cache': ('use_cache', False),
+}
+
+
 
 class CLIParser:
     """BD2 负载测试参数解析器"""
@@ -20,8 +142,12 @@ class CLIParser:
             Dict[str, Any]: 解析后的参数字典
         """
         try:
+            # 绑定为局部变量，避免循环中反复访问 sys.argv
+            argv = sys.argv
+            argc = len(argv)
+            
             # 确保至少有一个参数（程序名）
-            if len(sys.argv) < 2:
+            if argc < 2:
                 CLIParser._show_help()
                 sys.exit(0)
 
@@ -31,128 +157,75 @@ class CLIParser:
                 'duration': None,         # 测试持续时间（秒）
                 'uds_log': False,         # UDS日志
                 'ccs_log': False,         # CCS日志
-                'log_level': None         # 日志级别
+                'log_level': None,        # 日志级别
+                'stats_interval': 1.0,    # 统计信息打印间隔（秒）
+                'target_rps': None,       # 目标执行速率（次/秒）
+                'use_cache': True,        # 复用已校验的测试用例缓存
+                'concurrency': 1          # 并发执行线程数
             }
             
             # 处理第一个参数：必须是测试用例文件
-            if sys.argv[1] in ['-h', '--help']:
+            if argv[1] in _HELP_FLAGS:
                 CLIParser._show_help()
                 sys.exit(0)
-            elif sys.argv[1].startswith('-'):
-                click.echo("错误: 第一个参数必须是测试用例文件")
+            elif argv[1].startswith('-'):
+                sys.stderr.write("错误: 第一个参数必须是测试用例文件\n")
                 sys.exit(1)
                 
             # 获取工程根目录下的 bd2_load_test 文件夹
             script_dir = os.path.dirname(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
             yaml_dir = os.path.join(script_dir, 'bd2_load_test')
-            yaml_file = os.path.join(yaml_dir, sys.argv[1])
+            yaml_file = os.path.join(yaml_dir, argv[1])
             
             # 检查文件是否存在
             if not os.path.isfile(yaml_file):
-                click.echo(f"错误: 测试用例文件不存在: {yaml_file}")
+                sys.stderr.write(f"错误: 测试用例文件不存在: {yaml_file}\n")
                 sys.exit(1)
                 
             args['test_cases_file'] = yaml_file
             
             # 解析可选参数
             i = 2
-            while i < len(sys.argv):
-                arg = sys.argv[i]
+            while i < argc:
+                arg = argv[i]
                 
                 # 处理帮助信息
-                if arg in ['-h', '--help']:
+                if arg in _HELP_FLAGS:
                     CLIParser._show_help()
                     sys.exit(0)
                 
-                # 处理其他参数
-                if arg in ['-t', '--time']:
-                    if i + 1 >= len(sys.argv):
-                        click.echo("错误: -t/--time 需要一个值")
-                        sys.exit(1)
-                    try:
-                        minutes = int(sys.argv[i + 1])
-                        if minutes <= 0:
-                            raise ValueError()
-                        args['duration'] = minutes * 60  # 转换为秒
-                    except ValueError:
-                        click.echo("错误: -t/--time 必须是正整数（分钟）")
-                        sys.exit(1)
-                    i += 2
-                    
-                elif arg == '--uds-log':
-                    if i + 1 >= len(sys.argv):
-                        click.echo("错误: --uds-log 需要一个值 (on/off)")
-                        sys.exit(1)
-                    value = sys.argv[i + 1]
-                    if value not in ['on', 'off']:
-                        click.echo("错误: --uds-log 的值必须是 on 或 off")
-                        sys.exit(1)
-                    args['uds_log'] = (value == 'on')
-                    i += 2
-                    
-                elif arg == '--ccs-log':
-                    if i + 1 >= len(sys.argv):
-                        click.echo("错误: --ccs-log 需要一个值 (on/off)")
-                        sys.exit(1)
-                    value = sys.argv[i + 1]
-                    if value not in ['on', 'off']:
-                        click.echo("错误: --ccs-log 的值必须是 on 或 off")
-                        sys.exit(1)
-                    args['ccs_log'] = (value == 'on')
-                    i += 2
-                    
-                elif arg == '--log-level':
-                    if i + 1 >= len(sys.argv):
-                        click.echo("错误: --log-level 需要一个值")
-                        sys.exit(1)
-                    value = sys.argv[i + 1]
-                    if value not in ['DEBUG', 'INFO', 'WARNING', 'ERROR', 'CRITICAL']:
-                        click.echo("错误: --log-level 的值必须是 DEBUG, INFO, WARNING, ERROR, 或 CRITICAL")
-                        sys.exit(1)
-                    args['log_level'] = value
-                    i += 2
-                    
-                else:
-                    click.echo(f"错误: 未知的参数 '{arg}'")
+                # 处理开关参数（不带值）
+                flag = _FLAG_OPTIONS.get(arg)
+                if flag is not None:
+                    key, value = flag
+                    args[key] = value
+                    i += 1
+                    continue
+                
+                # 处理带值参数
+                spec = _VALUE_OPTIONS.get(arg)
+                if spec is None:
+                    sys.stderr.write(f"错误: 未知的参数 '{arg}'\n")
                     sys.exit(1)
+                
+                key, convert, missing_msg, invalid_msg = spec
+                if i + 1 >= argc:
+                    sys.stderr.write(f"错误: {missing_msg}\n")
+                    sys.exit(1)
+                try:
+                    args[key] = convert(argv[i + 1])
+                except ValueError:
+                    sys.stderr.write(f"错误: {invalid_msg}\n")
+                    sys.exit(1)
+                i += 2
 
             return args
 
         except Exception as e:
-            click.echo(f"错误: {str(e)}")
+            sys.stderr.write(f"错误: {str(e)}\n")
             sys.exit(1)
 
     @staticmethod
     def _show_help():
         """显示帮助信息"""
-        click.echo("""
-用法: bd2_load_test.py <测试用例文件> [选项]
-
-BD2 负载测试工具
-
-参数:
-  测试用例文件            YAML格式的测试用例文件（必需）
-
-选项:
-  -t, --time <分钟>     测试持续时间（分钟）
-  --uds-log on|off      启用/禁用 UDS 日志
-  --ccs-log on|off      启用/禁用 CCS 日志
-  --log-level LEVEL     设置日志级别 (DEBUG, INFO, WARNING, ERROR, CRITICAL)
-  -h, --help            显示帮助信息
-
-示例:
-  # 基本用法（必需参数）
-  bd2_load_test.py load_test_cases_001.yaml
-
-  # 设置测试时间（例如运行 60 分钟）
-  bd2_load_test.py load_test_cases_001.yaml -t 60
-
-  # 启用 UDS 日志和 CCS 日志
-  bd2_load_test.py load_test_cases_001.yaml --uds-log on --ccs-log on
-
-  # 设置日志级别
-  bd2_load_test.py load_test_cases_001.yaml --log-level DEBUG
-
-  # 组合使用
-  bd2_load_test.py load_test_cases_001.yaml -t 60 --uds-log on --ccs-log on --log-level DEBUG
-""")
+        sys.stdout.write(_HELP)
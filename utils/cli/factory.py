@@ -1,13 +1,13 @@
-from typing import Dict, Type
+from typing import Dict, Type, Tuple, Union
 import os
+import importlib
 from .base import BaseCLIParser
-from .bd2_client_sim.cli_parser import CLIParser as ClientSimCLIParser
-from .bd2_load_test.cli_parser import CLIParser as LoadTestCLIParser
 
 class CLIParserFactory:
-    _parsers: Dict[str, Type[BaseCLIParser]] = {
-        'bd2_client_sim.py': ClientSimCLIParser,
-        'bd2_load_test.py': LoadTestCLIParser,
+    # 脚本名 -> 解析器类，或 (模块路径, 类名) 以便在首次使用时才导入
+    _parsers: Dict[str, Union[Type[BaseCLIParser], Tuple[str, str]]] = {
+        'bd2_client_sim.py': ('utils.cli.bd2_client_sim.cli_parser', 'CLIParser'),
+        'bd2_load_test.py': ('utils.cli.bd2_load_test.cli_parser', 'CLIParser'),
     }
 
     @classmethod
@@ -17,9 +17,14 @@ class CLIParserFactory:
         parser_class = cls._parsers.get(script_name)
         if not parser_class:
             raise ValueError(f"No parser found for script: {script_name}")
+        if isinstance(parser_class, tuple):
+            # 按需导入解析器模块，并缓存导入后的类
+            module_path, attr_name = parser_class
+            parser_class = getattr(importlib.import_module(module_path), attr_name)
+            cls._parsers[script_name] = parser_class
         return parser_class()
 
     @classmethod
     def register_parser(cls, script_name: str, parser_class: Type[BaseCLIParser]):
         """注册新的解析器"""
-        cls._parsers[script_name] = parser_class 
\ No newline at end of file
+        cls._parsers[script_name] = parser_class
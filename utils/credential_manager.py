@@ -8,11 +8,19 @@ Changelog:
 
 from pathlib import Path
 import json
+import base64
 from cryptography.fernet import Fernet
+from cryptography.hazmat.primitives.ciphers.aead import AESGCM
 import os
 import socket
+from config.config import CONFIG
 from utils.logger_manager import LoggerManager
 
+# 凭据文件格式：版本字节 + 12 字节 nonce + AES-256-GCM 密文
+# 不以版本字节开头的凭据文件按旧的 Fernet 令牌解密
+_AESGCM_VERSION = b'\x01'
+_NONCE_SIZE = 12
+
 class CredentialManager:
     """Handles credential management and storage"""
 
@@ -26,6 +34,8 @@ class CredentialManager:
 
     def __init__(self):
         self.logger = LoggerManager.get_logger(__file__)  # 使用默认环境
+        self._cred_cache = {}  # 凭据文件路径 -> ((mtime_ns, size), 解密后的凭据)
+        self._cipher_cache = {}  # (密钥文件路径, 是否AESGCM) -> (mtime_ns, 加解密实例)
         self._init_crypto()
 
     def _init_crypto(self):
@@ -49,35 +59,119 @@ class CredentialManager:
         # 记录主机名，用于日志显示
         self.hostname = hostname
 
-    def _get_fernet(self, key_path):
-        """获取指定密钥的Fernet实例"""
-        if key_path.exists():
-            return Fernet(key_path.read_bytes())
-        return None
+    def _get_cipher(self, key_path, aead):
+        """
+        获取指定密钥的加解密实例，密钥文件未变化时复用已创建的实例
+        :param key_path: 密钥文件路径
+        :param aead: True 返回 AESGCM 实例，False 返回 Fernet 实例（用于旧凭据）
+        :return: 加解密实例
+        :raises FileNotFoundError: 密钥文件不存在
+        """
+        cache_key = (key_path, aead)
+        mtime = key_path.stat().st_mtime_ns
+        cached = self._cipher_cache.get(cache_key)
+        if cached is None or cached[0] != mtime:
+            key = key_path.read_bytes()
+            cipher = AESGCM(base64.urlsafe_b64decode(key)) if aead else Fernet(key)
+            cached = self._cipher_cache[cache_key] = (mtime, cipher)
+        return cached[1]
 
-    def save_project_credentials(self, vm_username, vm_password, sso_username, sso_password):
+    def _decrypt(self, blob, key_path):
         """
-        保存项目级凭据（通常是公共账号）
-        保存位置：var/credentials/auth.enc
+        解密凭据文件内容，兼容旧的 Fernet 格式
+        :param blob: 凭据文件内容
+        :param key_path: 密钥文件路径
+        :return: 解密后的明文
+        """
+        if blob[:1] == _AESGCM_VERSION:
+            # 通过 memoryview 切片传递密文，避免复制整个密文
+            view = memoryview(blob)
+            nonce_end = 1 + _NONCE_SIZE
+            return self._get_cipher(key_path, True).decrypt(view[1:nonce_end], view[nonce_end:], None)
+        return self._get_cipher(key_path, False).decrypt(blob)
+
+    @staticmethod
+    def _encrypt(plaintext):
+        """
+        使用新生成的 AES-256-GCM 密钥加密凭据
+        :param plaintext: 待加密的明文
+        :return: (base64 编码的密钥, 凭据文件内容)
+        """
+        key = AESGCM.generate_key(bit_length=256)
+        nonce = os.urandom(_NONCE_SIZE)
+        blob = _AESGCM_VERSION + nonce + AESGCM(key).encrypt(nonce, plaintext, None)
+        return base64.urlsafe_b64encode(key), blob
+
+    def _load_encrypted(self, config_path, key_path, expected_type):
+        """
+        读取并解密凭据文件，文件未变化时直接返回缓存的解密结果
+        :param config_path: 加密凭据文件路径
+        :param key_path: 密钥文件路径
+        :param expected_type: 期望的凭据类型（personal/project）
+        :return: 凭据字典，凭据文件或密钥文件不存在、类型不符时返回 None
+        """
+        # 直接访问文件，不存在时捕获异常，避免额外的 exists() 检查
+        try:
+            st = config_path.stat()
+        except FileNotFoundError:
+            return None
+        stamp = (st.st_mtime_ns, st.st_size)
+        cached = self._cred_cache.get(config_path)
+        if cached is None or cached[0] != stamp:
+            try:
+                plaintext = self._decrypt(config_path.read_bytes(), key_path)
+            except FileNotFoundError:
+                return None
+            data = json.loads(plaintext)
+            if data.get("type") != expected_type:
+                data = None
+            # 按路径覆盖，旧的缓存条目随之失效
+            cached = self._cred_cache[config_path] = (stamp, data)
+        data = cached[1]
+        return dict(data) if data is not None else None
+
+    def _save_credentials(self, config_path, key_path, cred_type, vm_username, vm_password,
+                          sso_username, sso_password):
+        """
+        加密并保存凭据（每次保存都生成新密钥）
+        :param config_path: 加密凭据文件路径
+        :param key_path: 密钥文件路径
+        :param cred_type: 凭据类型（project/personal）
         """
         # 确保配置目录存在
-        self.project_config_path.parent.mkdir(parents=True, exist_ok=True)
-        
-        # 生成新密钥
-        key = Fernet.generate_key()
-        self.project_key_path.write_bytes(key)
-        fernet = Fernet(key)
-        
-        # 加密保存凭据
+        config_path.parent.mkdir(parents=True, exist_ok=True)
+
         data = {
-            "type": "project",  # 标记凭据类型
+            "type": cred_type,  # 标记凭据类型
             "vm_username": vm_username,
             "vm_password": vm_password,
             "sso_username": sso_username,
             "sso_password": sso_password
         }
-        encrypted = fernet.encrypt(json.dumps(data).encode())
-        self.project_config_path.write_bytes(encrypted)
+        key, encrypted = self._encrypt(json.dumps(data).encode())
+
+        # 先完整写入临时文件，再通过 os.replace 替换，避免中断时留下写了一半的文件
+        # 注意：两次替换之间仍存在密钥与凭据不匹配的窗口
+        tmp_key_path = key_path.with_name(key_path.name + ".tmp")
+        tmp_config_path = config_path.with_name(config_path.name + ".tmp")
+        try:
+            tmp_key_path.write_bytes(key)
+            tmp_config_path.write_bytes(encrypted)
+            os.replace(tmp_key_path, key_path)
+            os.replace(tmp_config_path, config_path)
+        except OSError:
+            # 保存失败时清理残留的临时文件
+            tmp_key_path.unlink(missing_ok=True)
+            tmp_config_path.unlink(missing_ok=True)
+            raise
+
+    def save_project_credentials(self, vm_username, vm_password, sso_username, sso_password):
+        """
+        保存项目级凭据（通常是公共账号）
+        保存位置：var/credentials/auth.enc
+        """
+        self._save_credentials(self.project_config_path, self.project_key_path, "project",
+                               vm_username, vm_password, sso_username, sso_password)
         self.logger.info(f"项目凭据已加密保存到: {self.project_config_path}")
 
     def save_user_credentials(self, vm_username, vm_password, sso_username, sso_password):
@@ -85,33 +179,15 @@ class CredentialManager:
         保存用户个人凭据
         保存位置：var/credentials/hosts/<hostname>/auth.enc
         """
-        # 确保用户配置目录存在
-        self.user_config_path.parent.mkdir(parents=True, exist_ok=True)
-        
-        # 生成新密钥
-        key = Fernet.generate_key()
-        self.user_key_path.write_bytes(key)
-        fernet = Fernet(key)
-        
-        # 加密保存凭据
-        data = {
-            "type": "personal",  # 标记凭据类型
-            "vm_username": vm_username,
-            "vm_password": vm_password,
-            "sso_username": sso_username,
-            "sso_password": sso_password
-        }
-        encrypted = fernet.encrypt(json.dumps(data).encode())
-        self.user_config_path.write_bytes(encrypted)
+        self._save_credentials(self.user_config_path, self.user_key_path, "personal",
+                               vm_username, vm_password, sso_username, sso_password)
         self.logger.info(f"个人凭据已加密保存到: {self.user_config_path}")
 
     def remove_project_credentials(self):
         """删除项目级凭据"""
         try:
-            if self.project_config_path.exists():
-                self.project_config_path.unlink()
-            if self.project_key_path.exists():
-                self.project_key_path.unlink()
+            self.project_config_path.unlink(missing_ok=True)
+            self.project_key_path.unlink(missing_ok=True)
             self.logger.info("项目凭据已删除")
         except Exception as e:
             self.logger.error(f"删除项目凭据失败: {str(e)}")
@@ -120,10 +196,8 @@ class CredentialManager:
     def remove_user_credentials(self):
         """删除用户个人凭据"""
         try:
-            if self.user_config_path.exists():
-                self.user_config_path.unlink()
-            if self.user_key_path.exists():
-                self.user_key_path.unlink()
+            self.user_config_path.unlink(missing_ok=True)
+            self.user_key_path.unlink(missing_ok=True)
             self.logger.info("个人凭据已删除")
         except Exception as e:
             self.logger.error(f"删除个人凭据失败: {str(e)}")
@@ -137,32 +211,25 @@ class CredentialManager:
         3. config.yaml 中的明文配置
         """
         # 1. 尝试加载用户个人凭据
-        if self.user_config_path.exists() and self.user_key_path.exists():
-            try:
-                fernet = self._get_fernet(self.user_key_path)
-                encrypted = self.user_config_path.read_bytes()
-                data = json.loads(fernet.decrypt(encrypted))
-                if data.get("type") == "personal":
-                    self.logger.debug(f"使用个人凭据（来自：{self.user_config_path}）")
-                    return data
-            except Exception as e:
-                self.logger.error(f"读取个人凭据失败: {str(e)}")
+        try:
+            data = self._load_encrypted(self.user_config_path, self.user_key_path, "personal")
+            if data is not None:
+                self.logger.debug(f"使用个人凭据（来自：{self.user_config_path}）")
+                return data
+        except Exception as e:
+            self.logger.error(f"读取个人凭据失败: {str(e)}")
 
         # 2. 尝试加载项目凭据
-        if self.project_config_path.exists() and self.project_key_path.exists():
-            try:
-                fernet = self._get_fernet(self.project_key_path)
-                encrypted = self.project_config_path.read_bytes()
-                data = json.loads(fernet.decrypt(encrypted))
-                if data.get("type") == "project":
-                    self.logger.debug(f"使用项目凭据（来自：{self.project_config_path}）")
-                    return data
-            except Exception as e:
-                self.logger.error(f"读取项目凭据失败: {str(e)}")
+        try:
+            data = self._load_encrypted(self.project_config_path, self.project_key_path, "project")
+            if data is not None:
+                self.logger.debug(f"使用项目凭据（来自：{self.project_config_path}）")
+                return data
+        except Exception as e:
+            self.logger.error(f"读取项目凭据失败: {str(e)}")
 
         # 3. 尝试从 config.yaml 加载明文配置
         try:
-            from config.config import CONFIG
             vm_username = CONFIG.get("basic.vm_username")
             vm_password = CONFIG.get("basic.vm_password")
             sso_username = CONFIG.get("basic.sso_username")
@@ -182,9 +249,13 @@ class CredentialManager:
 
         return None
 
-    def get_current_credentials_info(self):
-        """获取当前使用的凭据信息"""
-        creds = self.get_current_credentials()
+    def get_current_credentials_info(self, creds=None):
+        """
+        获取当前使用的凭据信息
+        :param creds: 已通过 get_current_credentials 获取的凭据，为 None 时重新加载
+        """
+        if creds is None:
+            creds = self.get_current_credentials()
         if not creds:
             return "未找到任何可用的凭据"
         
@@ -10,6 +10,11 @@ Changelog:
 """
 
 import logging
+import logging.handlers
+import functools
+import atexit
+import queue
+import json
 import sys
 import os
 import re
@@ -17,12 +22,121 @@ from config.config import CONFIG
 from datetime import datetime
 
 
+# 使用统一的日志格式：[时间] [线程名] [模块名] 日志级别 - 日志信息
+LOG_FORMAT = "[%(asctime)s.%(msecs)03d][%(threadName)s][%(name)s]%(levelname)s - %(message)s"
+DATE_FORMAT = "%Y-%m-%d %H:%M:%S"
+# 文件日志缓冲的记录条数，达到后批量写入
+FILE_LOG_BUFFER_CAPACITY = 512
+
+# 表示缓存值尚未计算的哨兵对象
+_MISSING = object()
+
+
+@functools.lru_cache(maxsize=256)
+def _strip_py(name):
+    """
+    移除文件名末尾的 .py 后缀（结果缓存，每条日志记录都会调用）
+    :param name: 文件名
+    :return: 去掉 .py 后缀的文件名
+    """
+    return name[:-3] if name.endswith('.py') else name
+
+
+class SecureFormatter(logging.Formatter):
+    def format(self, record):
+        # 移除文件名中的.py后缀
+        record.filename = _strip_py(record.filename)
+        # 如果是主线程，显示为main
+        if record.threadName == "MainThread":
+            record.threadName = "main"
+        return super().format(record)
+
+
+class PasswordMaskFilter(logging.Filter):
+    """
+    隐藏日志中的密码
+    挂在 handler 上，只处理通过了 handler 级别过滤、确实会输出的记录；
+    对格式化后的完整消息做隐藏，避免改写 msg 模板破坏 % 参数格式化
+    凭据（vm/sso 密码）会出现在认证请求的日志中，因此控制台和文件日志都启用隐藏
+    """
+
+    def filter(self, record):
+        if getattr(record, '_password_masked', False):
+            return True
+        try:
+            message = record.getMessage()
+        except Exception:
+            # 格式化失败交给 handler.emit 按常规流程报告
+            return True
+        # 保存格式化结果，后续 formatter 无需再次做 % 格式化
+        record.msg = LoggerManager.mask_passwords(message)
+        record.args = None
+        record._password_masked = True
+        return True
+
+
+class _BatchFileHandler(logging.FileHandler):
+    """逐条写入但不逐条 flush 的文件 handler，由 _FileLogBuffer 批量转发后统一 flush"""
+
+    def emit(self, record):
+        if self.stream is None:
+            self.stream = self._open()
+        try:
+            self.stream.write(self.format(record) + self.terminator)
+        except Exception:
+            self.handleError(record)
+
+
+class _FileLogBuffer(logging.handlers.MemoryHandler):
+    """缓冲日志记录，达到容量或遇到 ERROR 时批量写入目标文件，并只 flush 一次"""
+
+    def flush(self):
+        super().flush()
+        target = self.target
+        if target is not None:
+            target.flush()
+
+
+def _close_handlers(handlers):
+    """
+    关闭 handler，MemoryHandler 会先把缓冲的日志写入目标再一并关闭目标
+    :param handlers: 待关闭的 handler 列表
+    """
+    for handler in handlers:
+        target = getattr(handler, 'target', None)
+        handler.close()
+        if target is not None:
+            target.close()
+
+
+# 所有 handler 共享的格式化器和密码过滤器，只创建一次
+_FORMATTER = SecureFormatter(LOG_FORMAT, DATE_FORMAT)
+_PASSWORD_FILTER = PasswordMaskFilter()
+
+
+def _compile_mask_patterns(fields):
+    """
+    预编译密码隐藏所用的正则表达式
+    :param fields: 需要隐藏密码的字段
+    :return: (正则表达式, 替换文本) 元组
+    """
+    patterns = []
+    for field in fields:
+        patterns.append((re.compile(fr'{field}=["\']?[^"\'\s]+["\']?'),
+                         f'{field}=*******'))
+        patterns.append((re.compile(fr'"{field}":\s*["\']?[^"\'\s]+["\']?'),
+                         f'"{field}": "*******"'))
+    return tuple(patterns)
+
+
 class LoggerManager:
     _instance = None  # Singleton pattern to ensure only one LoggerManager instance globally
     _logger = None  # Shared logger object
     _log_env = None  # Log environment (script name)
     _log_level = None  # Specified log level
     _session_dir = None  # Current session directory
+    _file_listener = None  # 文件日志队列的监听线程
+    _script_env = _MISSING  # 缓存的当前脚本日志环境（未计算时为 _MISSING）
 
     # 定义需要记录文件日志的脚本
     FILE_LOG_SCRIPTS = {
@@ -31,7 +145,7 @@ class LoggerManager:
         'bd2_load_test'
     }
 
-    # 需要隐藏密码的字段
+    # 需要隐藏密码的字段（区分大小写，项目中的字段名均为小写）
     PASSWORD_FIELDS = {
         'password',
         'pwd',
@@ -45,9 +159,14 @@ class LoggerManager:
         获取当前运行脚本的日志环境
         - 如果脚本在 FILE_LOG_SCRIPTS 中，返回脚本名
         - 否则返回 None，表示不记录文件日志
+        结果在首次调用时计算并缓存（运行的脚本在进程内不会变化）
         """
-        current_script = os.path.basename(sys.argv[0]).replace('.py', '')
-        return current_script if current_script in cls.FILE_LOG_SCRIPTS else None
+        script_env = cls._script_env
+        if script_env is _MISSING:
+            current_script = _strip_py(os.path.basename(sys.argv[0]))
+            script_env = current_script if current_script in cls.FILE_LOG_SCRIPTS else None
+            cls._script_env = script_env
+        return script_env
 
     @classmethod
     def get_session_dir(cls):
@@ -126,34 +245,25 @@ class LoggerManager:
         if not isinstance(message, str):
             return message
 
-        # 处理 JSON 格式的消息
-        try:
-            import json
-            data = json.loads(message)
-            if isinstance(data, dict):
-                for key in cls.PASSWORD_FIELDS:
-                    if key in data:
-                        data[key] = "*******"
-                return json.dumps(data)
-        except:
-            pass
-
-        # 处理普通文本消息
-        # 1. 处理 key=value 格式
-        for field in cls.PASSWORD_FIELDS:
-            message = re.sub(
-                fr'{field}=["\']?[^"\'\s]+["\']?',
-                f'{field}=*******',
-                message,
-                flags=re.IGNORECASE
-            )
-            # 2. 处理 "key": "value" 格式
-            message = re.sub(
-                fr'"{field}":\s*["\']?[^"\'\s]+["\']?',
-                f'"{field}": "*******"',
-                message,
-                flags=re.IGNORECASE
-            )
+        # 快速判断：消息中不含任何密码字段时直接返回
+        if not any(field in message for field in cls.PASSWORD_FIELDS):
+            return message
+
+        # 处理 JSON 格式的消息（仅在消息以 { 或 [ 开头时尝试解析）
+        if message.lstrip()[:1] in ('{', '['):
+            try:
+                data = json.loads(message)
+                if isinstance(data, dict):
+                    for key in cls.PASSWORD_FIELDS:
+                        if key in data:
+                            data[key] = "*******"
+                    return json.dumps(data, ensure_ascii=False)
+            except ValueError:
+                pass
+
+        # 处理普通文本消息：1. key=value 格式  2. "key": "value" 格式
+        for pattern, replacement in _MASK_PATTERNS:
+            message = pattern.sub(replacement, message)
 
         return message
 
@@ -162,37 +272,24 @@ class LoggerManager:
         if LoggerManager._logger is None:
             LoggerManager._logger = logging.getLogger("UnifiedLogger")
         
-        # 移除所有现有的handlers
+        # 移除所有现有的handlers（先关闭，确保缓冲的日志写入文件并释放文件句柄）
+        LoggerManager._stop_file_listener()
         if LoggerManager._logger.handlers:
+            _close_handlers(LoggerManager._logger.handlers)
             LoggerManager._logger.handlers.clear()
             
         # 根据优先级策略设置日志级别
         log_level = self.determine_log_level()
         LoggerManager._logger.setLevel(getattr(logging, log_level))
 
-        # 使用统一的日志格式：[时间] [线程名] [模块名] 日志级别 - 日志信息
-        log_format = "[%(asctime)s.%(msecs)03d][%(threadName)s][%(name)s]%(levelname)s - %(message)s"
-        date_format = "%Y-%m-%d %H:%M:%S"
-        
-        class SecureFormatter(logging.Formatter):
-            def format(self, record):
-                # 移除文件名中的.py后缀
-                record.filename = record.filename.replace('.py', '')
-                # 如果是主线程，显示为main
-                if record.threadName == "MainThread":
-                    record.threadName = "main"
-                # # 隐藏密码
-                # if hasattr(record, 'msg'):
-                #     record.msg = LoggerManager.mask_passwords(record.msg)
-                return super().format(record)
-        
-        formatter = SecureFormatter(log_format, date_format)
+        formatter = _FORMATTER
 
         # Console log
         if CONFIG.get("log.log_to_console", True):
             console_handler = logging.StreamHandler(sys.stdout)
             console_handler.setLevel(getattr(logging, log_level))
             console_handler.setFormatter(formatter)
+            console_handler.addFilter(_PASSWORD_FILTER)
             LoggerManager._logger.addHandler(console_handler)
 
         # File log - 只在指定脚本时创建
@@ -207,10 +304,32 @@ class LoggerManager:
             # 生成日志文件名
             log_file = os.path.join(LoggerManager._session_dir, "script.log")
             
-            file_handler = logging.FileHandler(log_file, encoding='utf-8')
+            file_handler = _BatchFileHandler(log_file, encoding='utf-8')
             file_handler.setLevel(getattr(logging, log_level))
             file_handler.setFormatter(formatter)
-            LoggerManager._logger.addHandler(file_handler)
+
+            # 通过 MemoryHandler 批量写入文件，ERROR 及以上级别立即刷新
+            buffered_handler = _FileLogBuffer(
+                capacity=FILE_LOG_BUFFER_CAPACITY,
+                flushLevel=logging.ERROR,
+                target=file_handler,
+                flushOnClose=True
+            )
+            buffered_handler.setLevel(getattr(logging, log_level))
+            buffered_handler.addFilter(_PASSWORD_FILTER)
+
+            # 文件日志经队列交给后台线程写入，业务线程只负责入队
+            # 控制台日志仍同步输出，保证与脚本中 print 的输出顺序一致
+            file_queue = queue.SimpleQueue()
+            queue_handler = logging.handlers.QueueHandler(file_queue)
+            queue_handler.setLevel(getattr(logging, log_level))
+            # 级别过滤只在入队时由 queue_handler 完成，监听线程不再按 handler 级别重复过滤，
+            # 避免 set_log_level 调高级别时丢弃已入队的日志
+            LoggerManager._file_listener = logging.handlers.QueueListener(
+                file_queue, buffered_handler, respect_handler_level=False
+            )
+            LoggerManager._file_listener.start()
+            LoggerManager._logger.addHandler(queue_handler)
 
         # 禁用日志传播到父logger
         LoggerManager._logger.propagate = False
@@ -219,9 +338,22 @@ class LoggerManager:
     def set_log_level(cls, log_level):
         """设置指定的日志级别"""
         cls._log_level = log_level
-        # 如果logger已经初始化，重新初始化以应用新的日志级别
+        # 如果logger已经初始化，直接更新logger和现有handler的级别，不重建handler（避免重新打开日志文件）
         if cls._instance and cls._logger:
-            cls._instance._initialize_logger()
+            level = getattr(logging, log_level)
+            cls._logger.setLevel(level)
+            for handler in cls._logger.handlers:
+                handler.setLevel(level)
+
+    @classmethod
+    def _stop_file_listener(cls):
+        """停止文件日志的监听线程，写完队列中剩余的日志后关闭文件"""
+        listener = cls._file_listener
+        if listener is None:
+            return
+        cls._file_listener = None
+        listener.stop()
+        _close_handlers(listener.handlers)
 
     @classmethod
     def get_logger(cls, file_path, env=None):
@@ -233,7 +365,7 @@ class LoggerManager:
         if env is None:
             env = cls.get_current_script_env()
         instance = cls(env)  # Ensure LoggerManager is initialized according to environment
-        filename = os.path.basename(file_path).replace(".py", "")  # Extract filename (remove .py)
+        filename = _strip_py(os.path.basename(file_path))  # Extract filename (remove .py)
         logger = logging.getLogger(filename)
         
         # 确保子logger继承UnifiedLogger的设置
@@ -250,3 +382,10 @@ class LoggerManager:
         - file_path: Pass `__file__` to automatically extract filename
         """
         return cls.get_logger(file_path, env=None)
+
+
+# 按 PASSWORD_FIELDS 预编译的密码隐藏正则，模块加载时只编译一次
+_MASK_PATTERNS = _compile_mask_patterns(LoggerManager.PASSWORD_FIELDS)
+
+# 进程退出时先写完文件日志队列（在 logging.shutdown 之前执行）
+atexit.register(LoggerManager._stop_file_listener)